@@ -1,11 +1,14 @@
 from loguru import logger
 from fire import Fire
 from utils import (
-    get_msg, init, get_dblp_items, request_data, 
-    write_venue_yaml
+    get_msg, init, request_data, create_session,
+    load_venue_yaml, merge_venue_items, dump_venue_yaml,
+    load_yaml, NOT_MODIFIED
 )
-import yaml
 from pathlib import Path
+import asyncio
+import itertools
+import orjson
 import os
 
 class Scaffold:
@@ -17,6 +20,9 @@ class Scaffold:
         self.data_out_dir.mkdir(exist_ok=True)
 
     def run(self, env: str = "dev", global_cfg_path: str = "./../config.yaml"):
+        asyncio.run(self._run_async(env=env, global_cfg_path=global_cfg_path))
+
+    async def _run_async(self, env: str, global_cfg_path: str, concurrency: int = 4):
         # Initialize global settings (logging, etc)
         global_cfg = init(cfg_path=global_cfg_path)
         
@@ -26,65 +32,101 @@ class Scaffold:
             logger.warning(f"No config files found in {self.configs_dir}")
             return
 
+        # Parse all topic configs up front
+        topic_cfgs = [(c_file, load_yaml(c_file)) for c_file in config_files]
+
         # Load cache for DBLP to avoid duplicates across runs
-        cache_path = global_cfg["cache_path"] / "dblp_cache.yaml"
-        dblp_cache = yaml.safe_load(open(cache_path, "r")) if cache_path.exists() else {}
+        cache_path = global_cfg["cache_path"] / "dblp_cache.json"
+        dblp_cache = orjson.loads(cache_path.read_bytes()) if cache_path.exists() else {}
+        # Per-topic ETag / Last-Modified validators for conditional requests
+        dblp_meta = dblp_cache.setdefault("__meta__", {})
+        dblp_meta_before = {topic: dict(meta) for topic, meta in dblp_meta.items()}
         
-        aggregated_msg = ""
+        aggregated_msg_parts = []
         total_flag = False
 
-        for c_file in config_files:
+        # Bound concurrent requests to stay polite towards dblp.org
+        sem = asyncio.Semaphore(concurrency)
+
+        # The URL template from global config
+        dblp_url_template = global_cfg["dblp"]["url"]
+        config_topics = [
+            (c_file, topic_cfg.get("dblp", {}).get("topics", []))
+            for c_file, topic_cfg in topic_cfgs
+        ]
+
+        # Request data for every topic of every config concurrently
+        async with create_session() as session:
+            tasks = [
+                request_data(
+                    session,
+                    dblp_url_template.format(topic_query),
+                    sem,
+                    meta=dblp_meta.setdefault(topic_query, {}),
+                )
+                for _, topics in config_topics
+                for topic_query in topics
+            ]
+            results = iter(await asyncio.gather(*tasks))
+
+        for c_file, topics in config_topics:
             logger.info(f"Processing topic config: {c_file.name}")
-            
-            with open(c_file, 'r') as f:
-                topic_cfg = yaml.safe_load(f)
-            
+
             # Target output file in _data/ (e.g., federated.yaml)
             target_yaml_path = self.data_out_dir / c_file.name
-            
-            # The URL template from global config
-            dblp_url_template = global_cfg["dblp"]["url"]
-            topics = topic_cfg.get("dblp", {}).get("topics", [])
 
             topic_new_items_found = False
+            # Parse the target once and merge every topic into it in memory
+            venue_data = load_venue_yaml(target_yaml_path)
 
-            for topic_query in topics:
-                # Request data
-                dblp_data = request_data(dblp_url_template.format(topic_query))
-                if dblp_data is None:
+            # Cache and file writes stay sequential
+            for topic_query, items in zip(topics, itertools.islice(results, len(topics))):
+                if items is None:
+                    continue
+                if items is NOT_MODIFIED:
+                    logger.info(f"No changes on DBLP for {topic_query}")
                     continue
 
-                items = get_dblp_items(dblp_data)
+                # Filter against cache by DBLP key
+                cached = set(dblp_cache.get(topic_query, []))
+                new_items = [item for item in items if item["key"] not in cached]
 
-                # Filter against cache
-                cached_items = dblp_cache.get(topic_query, [])
-                new_items = [item for item in items if item not in cached_items]
-                
                 if len(new_items) > 0:
                     topic_new_items_found = True
                     total_flag = True
-                    
+
                     # Update local cache object
                     if topic_query not in dblp_cache:
                         dblp_cache[topic_query] = []
-                    dblp_cache[topic_query].extend(new_items)
+                    dblp_cache[topic_query].extend(item["key"] for item in new_items)
 
                     # Generate messages for Github/Logs
-                    aggregated_msg += get_msg(new_items, topic_query, aggregated=True)
-                    
-                    # Write to the specific YAML file in _data/
-                    write_venue_yaml(new_items, target_yaml_path)
+                    aggregated_msg_parts.append(get_msg(new_items, topic_query, aggregated=True))
+
+                    merge_venue_items(new_items, venue_data)
                     logger.info(f"Added {len(new_items)} items to {target_yaml_path.name}")
 
-        # 2. Save updated cache
-        with open(cache_path, "w") as f:
-            yaml.safe_dump(dblp_cache, f, sort_keys=False, indent=2)
+            # Write to the specific YAML file in _data/ once per config
+            if topic_new_items_found:
+                dump_venue_yaml(venue_data, target_yaml_path)
+
+        # Drop placeholders for topics whose responses carried no validators
+        for topic_query in [t for t, meta in dblp_meta.items() if not meta]:
+            del dblp_meta[topic_query]
+
+        # 2. Save updated cache, atomically and only when something changed
+        if total_flag or dblp_meta != dblp_meta_before:
+            tmp_path = cache_path.with_suffix(".json.tmp")
+            tmp_path.write_bytes(orjson.dumps(dblp_cache, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, cache_path)
 
         # 3. Handle CI/CD Output
         if env == "prod" and total_flag:
             env_file = os.getenv("GITHUB_ENV")
             if env_file:
-                with open(env_file, "a") as f:
+                # Strip quotes once over the whole message
+                aggregated_msg = "".join(aggregated_msg_parts).replace("'", "")
+                with open(env_file, "a", encoding="utf-8") as f:
                     # Clip if necessary and write to Github Env
                     output_msg = aggregated_msg[:4000] + "..." if len(aggregated_msg) > 4096 else aggregated_msg
                     f.write(f"MSG<<EOF\n{output_msg}\nEOF\n")
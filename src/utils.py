@@ -5,10 +5,25 @@ from loguru import logger
 from pathlib import Path
 import ezkfg as ez
 import urllib.parse
-import requests
-import json
-import time
+import asyncio
+import aiohttp
+import ijson
 import random
+import time
+import email.utils
+import operator
+import functools
+
+# Prefer the libyaml-backed C loader/dumper, fall back to pure Python
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+class NoAliasDumper(Dumper):
+    """Dumper that writes shared objects out in full instead of as anchors/aliases"""
+
+    def ignore_aliases(self, data):
+        return True
 
 DEFAULT_HEADER = {
     "title": "Title",
@@ -58,26 +73,13 @@ def init(cfg_path: str):
     return cfg
 
 
-def get_item_info(item, key):
-    try:
-        return item[key]
-    except KeyError:
-        return ""
-
-
-def get_dblp_items(dblp_data):
-    try:
-        items = dblp_data["result"]["hits"]["hit"]
-    except KeyError:
-        items = []
-
+def get_dblp_items(content):
+    """Stream-parse a raw DBLP JSON response and yield one cleaned item per hit"""
     # item{'author', 'title', 'venue', 'year', 'type', 'access', 'key', 'doi', 'ee', 'url'}
-    res_items = []
-
-    for item in items:
-        res_item = {}
+    for item in ijson.items(content, "result.hits.hit.item"):
+        info = item["info"]
         # format author
-        authors = get_item_info(item["info"], "authors")
+        authors = info.get("authors", "")
         try:
             authors = [author["text"] for author in authors["author"]]
         except TypeError:
@@ -90,112 +92,190 @@ def get_dblp_items(dblp_data):
 
         # logger.info(f"authors: {authors}")
 
-        res_item["author"] = ", ".join(authors)
-        needed_keys = [
-            "title",
-            "venue",
-            "year",
-            "type",
-            "access",
-            "key",
-            "doi",
-            "ee",
-            "url",
-        ]
-        for key in needed_keys:
-            key_temp = get_item_info(item["info"], key)
-            res_item[key] = key_temp if key_temp else ""
-
-        res_items.append(res_item)
-
-    return res_items
+        res_item = {
+            "author": ", ".join(authors),
+            "title": info.get("title") or "",
+            "venue": info.get("venue") or "",
+            "year": info.get("year") or "",
+            "type": info.get("type") or "",
+            "access": info.get("access") or "",
+            "key": info.get("key") or "",
+            "doi": info.get("doi") or "",
+            "ee": info.get("ee") or "",
+            "url": info.get("url") or "",
+        }
+
+        yield res_item
+
+
+@functools.lru_cache(maxsize=None)
+def topic_name(topic):
+    """Readable name of a DBLP topic query, e.g. ICML for "...venue%3AICML%3A"."""
+    # change "topic" from url to string
+    return urllib.parse.unquote(topic).rsplit(":", 2)[-2]
 
 
 def get_msg(items, topic, aggregated=False):
-    # change "topic" from url to string
-    string_topic = urllib.parse.unquote(topic)
     # get name of topic
-    name_topic = string_topic.split(":")[-2]
+    name_topic = topic_name(topic)
 
     # print information of topic
-    msg = f"## [{name_topic}](https://dblp.org/search?q={topic})\\n\\n"
-    msg += f"""Explore {len(items)} new papers about {name_topic}.\\n\\n"""
+    parts = [
+        f"## [{name_topic}](https://dblp.org/search?q={topic})\\n\\n",
+        f"""Explore {len(items)} new papers about {name_topic}.\\n\\n""",
+    ]
 
     if aggregated == False:
         for item in items:
-            msg += f"{item['title']}\\n"
-            # msg += f"[{item['title']}]({item['url']})\\n"
-            # msg += f"- Authors: {item['author']}\\n"
-            # msg += f"- Venue: {item['venue']}\\n"
-            msg += f"- Year: {item['year']}\\n\\n"
-
-    msg = msg.replace("'", "")
-    return msg
-
-def request_data(url, retry=10, sleep_time=5):
-    try:
-        time.sleep(sleep_time + random.random() * 3)
-        response = requests.get(url)
-        response.raise_for_status()  # 如果响应状态不是200，将引发HTTPError异常
-        data = response.json()
-    # deal with errors
-    except Exception as e:
-        logger.error(f"Exception: {e}")
-        if retry > 0:
-            logger.info(f"retrying {url}")
-            return request_data(url, retry - 1)
-        else:
-            logger.error(f"Failed to request {url}")
-        return None
-    else:
-        return data
-    
-def update_yaml_from_dblp(items, topic, yaml_path):
-    if not yaml_path.exists():
-        data = {"section": []}
-    else:
-        data = yaml.safe_load(open(yaml_path)) or {"section": []}
-
-    section_title = urllib.parse.unquote(topic).split(":")[-2]
-
-    # ensure section exists
-    if section_title not in data:
-        data["section"].append({"title": section_title})
-        data[section_title] = []
-
-    existing = data[section_title]
-
-    # deduplicate by title + year
-    existing_keys = {(p["title"], p["year"]) for p in existing}
+            parts.append(f"{item['title']}\\n")
+            # parts.append(f"[{item['title']}]({item['url']})\\n")
+            # parts.append(f"- Authors: {item['author']}\\n")
+            # parts.append(f"- Venue: {item['venue']}\\n")
+            parts.append(f"- Year: {item['year']}\\n\\n")
 
-    for item in items:
-        key = (item["title"], item["year"])
-        if key in existing_keys:
-            continue
+    return "".join(parts)
+
+# returned by request_data on HTTP 304: the cached items are still current
+NOT_MODIFIED = object()
+
+USER_AGENT = "dblp-paper-daily (+https://github.com/sadimanna/fantastic-octo-happiness)"
 
-        existing.append({
-            "title": item["title"],
-            "authors": item["author"],
-            "venue": item["venue"],
-            "year": item["year"],
-            "url": item["url"] or item["ee"],
-        })
 
-    yaml.safe_dump(data, open(yaml_path, "w"), sort_keys=False)
+def create_session(pool_size=8, per_host=4):
+    """Create a shared HTTP session that keeps connections to dblp.org alive"""
+    connector = aiohttp.TCPConnector(limit=pool_size, limit_per_host=per_host)
+    timeout = aiohttp.ClientTimeout(total=30, sock_connect=5)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={"User-Agent": USER_AGENT},
+    )
+
 
+# upper bound in seconds for any single wait between retries
+MAX_RETRY_DELAY = 60
 
-# ... (rest of your imports and init functions remain the same)
 
-def write_venue_yaml(items, yaml_path):
+def retry_after_delay(headers, attempt):
+    """Seconds to wait after a 429, from Retry-After or exponential backoff"""
+    value = headers.get("Retry-After")
+    delay = 2 ** attempt
+    if value is not None:
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                retry_at = email.utils.parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                pass
+            else:
+                delay = retry_at.timestamp() - time.time()
+    return min(MAX_RETRY_DELAY, max(0.0, delay))
+
+
+def conditional_headers(meta):
+    """Request headers that let DBLP answer 304 for an unchanged topic"""
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+async def request_data(session, url, sem, meta=None, retry=10, sleep_time=5):
+    """
+    Fetch url and return the cleaned DBLP items of its response.
+
+    When meta is given, its stored ETag / Last-Modified validators are sent
+    and refreshed in place from a 200 response; a 304 returns NOT_MODIFIED.
+    """
+    headers = conditional_headers(meta) if meta is not None else {}
+
+    async with sem:
+        # courtesy delay, paid once per request rather than on every retry
+        await asyncio.sleep(sleep_time + random.random() * 3)
+
+        for attempt in range(retry + 1):
+            rate_limited = False
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        return NOT_MODIFIED
+                    if response.status == 429:
+                        rate_limited = True
+                        delay = retry_after_delay(response.headers, attempt)
+                    elif 400 <= response.status < 500 and response.status != 408:
+                        # other client errors (408 aside) will not go away by retrying
+                        logger.error(f"HTTP {response.status} for {url}, not retrying")
+                        return None
+                    else:
+                        response.raise_for_status()  # 如果响应状态不是200，将引发HTTPError异常
+                        # parse while still retrying, so truncated or non-JSON bodies are retried
+                        items = list(get_dblp_items(await response.read()))
+                        if meta is not None:
+                            meta.clear()
+                            if response.headers.get("ETag"):
+                                meta["etag"] = response.headers["ETag"]
+                            if response.headers.get("Last-Modified"):
+                                meta["last_modified"] = response.headers["Last-Modified"]
+                        return items
+            # deal with 408/5xx, connection/timeout errors and invalid bodies
+            except (aiohttp.ClientError, asyncio.TimeoutError, ijson.JSONError) as e:
+                logger.error(f"Exception: {e}")
+                delay = min(MAX_RETRY_DELAY, 2 ** attempt + random.random())
+            # anything else fails only this topic, not the whole run
+            except Exception as e:
+                logger.error(f"Unexpected exception for {url}: {e}")
+                return None
+
+            if attempt < retry:
+                if rate_limited:
+                    logger.warning(f"Rate limited, waiting {delay:.1f}s for {url}")
+                logger.info(f"retrying {url}")
+                await asyncio.sleep(delay)
+
+    logger.error(f"Failed to request {url}")
+    return None
+
+
+def load_yaml(yaml_path):
+    """
+    Load a yaml file with the fastest available loader
     """
-    Write DBLP items into specific data yaml in _data/
+    with open(yaml_path, 'rb') as f:
+        return yaml.load(f, Loader=Loader)
+
+
+def load_venue_yaml(yaml_path):
+    """
+    Load a data yaml from _data/, or an empty document if it does not exist
     """
     yaml_path = Path(yaml_path)
     if yaml_path.exists():
-        with open(yaml_path, 'r') as f:
-            data = yaml.safe_load(f) or {}
-    else:
-        data = {"section": []}
+        return load_yaml(yaml_path) or {"section": []}
+    return {"section": []}
+
+
+def dump_venue_yaml(data, yaml_path):
+    """
+    Write a data yaml back into _data/
+    """
+    with open(yaml_path, "w", encoding="utf-8") as f:
+        yaml.dump(data, f, Dumper=NoAliasDumper, sort_keys=False, indent=2)
+
+
+def merge_venue_items(items, data):
+    """
+    Merge DBLP items into an in-memory data yaml document
+    """
+    # (venue, year) buckets that received new entries and need sorting
+    dirty = set()
+    # venues that gained a new year bucket and need their years re-ordered
+    dirty_venues = set()
+    seen_sections = {s["title"] for s in data.setdefault("section", [])}
+    # Titles per (venue, year) bucket, built on first touch
+    title_index = {}
 
     for item in items:
         venue = item.get("venue", "Unknown Venue")
@@ -203,35 +283,43 @@ def write_venue_yaml(items, yaml_path):
         link = item.get("ee") or item.get("url")
 
         # Ensure section entry exists for the UI/Table of Contents
-        if not any(s['title'] == venue for s in data["section"]):
+        if venue not in seen_sections:
             data["section"].append({"title": venue})
+            seen_sections.add(venue)
         
         if venue not in data:
             data[venue] = {}
 
         if year not in data[venue]:
             data[venue][year] = {
-                "header": DEFAULT_HEADER.copy(),
-                "length": DEFAULT_LENGTH.copy(),
+                # shared, never mutated; NoAliasDumper emits them in full
+                "header": DEFAULT_HEADER,
+                "length": DEFAULT_LENGTH,
                 "body": [],
             }
+            dirty_venues.add(venue)
 
         body = data[venue][year]["body"]
-        existing_titles = {p["title"] for p in body}
-        
+        existing_titles = title_index.get((venue, year))
+        if existing_titles is None:
+            existing_titles = title_index[(venue, year)] = {p["title"] for p in body}
+
         if item["title"] not in existing_titles:
+            existing_titles.add(item["title"])
             body.append({
                 "title": item["title"],
                 "venue": venue,
                 "year": int(year) if year.isdigit() else year,
                 "link": link,
             })
-            body.sort(key=lambda x: x["title"])
+            dirty.add((venue, year))
+
+    # Sort each touched bucket once, after all items are appended
+    for venue, year in dirty:
+        data[venue][year]["body"].sort(key=operator.itemgetter("title"))
 
     # Sort years descending
-    for key in data:
-        if key != "section" and isinstance(data[key], dict):
-            data[key] = dict(sorted(data[key].items(), key=lambda x: x[0], reverse=True))
+    for venue in dirty_venues:
+        data[venue] = dict(sorted(data[venue].items(), key=operator.itemgetter(0), reverse=True))
 
-    with open(yaml_path, "w") as f:
-        yaml.safe_dump(data, f, sort_keys=False, indent=2)
\ No newline at end of file
+    return data